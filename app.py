@@ -1,7 +1,11 @@
 import streamlit as st
 import pickle
+import os
 import numpy as np
 from src.processor import preprocess_text
+from src.monitor import DriftMonitor, load_label_prior
+from src.cascade import Cascade, DEFAULT_THRESHOLD
+from src.features import load_feature_settings
 import time
 import base64
 
@@ -203,6 +207,40 @@ def load_assets():
 
 model, vectorizer, num_to_emo = load_assets()
 
+# Preprocessing each stage was trained with (saved by src/train.py)
+fast_features = load_feature_settings('models/tfidf_features.pkl')
+
+# Drift monitor shared across sessions
+@st.cache_resource
+def load_monitor(_vectorizer):
+    try:
+        return DriftMonitor(_vectorizer, load_label_prior())
+    except (OSError, KeyError, IndexError) as e:
+        st.warning(f"Drift monitoring disabled: {str(e)[:100]}")
+        return None
+
+monitor = load_monitor(vectorizer) if vectorizer is not None else None
+
+# Cascade: escalate low-confidence inputs to the char n-gram SVM if it has been trained
+@st.cache_resource
+def load_cascade(_model, _vectorizer):
+    stages = [('tfidf_lr', _vectorizer, _model, fast_features['keep_negation'])]
+    if os.path.exists('models/char_svm_model.pkl'):
+        try:
+            with open('models/char_svm_model.pkl', 'rb') as f:
+                char_model = pickle.load(f)
+            with open('models/char_tfidf_vectorizer.pkl', 'rb') as f:
+                char_vectorizer = pickle.load(f)
+            char_features = load_feature_settings('models/char_tfidf_features.pkl')
+            char_stage = ('char_svm', char_vectorizer, char_model, char_features['keep_negation'])
+            return Cascade(stages + [char_stage], threshold=DEFAULT_THRESHOLD)
+        except Exception as e:
+            # The fast stage can still serve on its own
+            st.warning(f"Char n-gram stage disabled: {str(e)[:100]}")
+    return Cascade(stages, threshold=DEFAULT_THRESHOLD)
+
+cascade = load_cascade(model, monitor or vectorizer) if model is not None and vectorizer is not None else None
+
 # Emotion Configuration
 EMOTION_CONFIG = {
     'joy': {'color': '#FFD700', 'emoji': '😊', 'name': 'Joy'},
@@ -349,12 +387,13 @@ if analyze_clicked and user_input.strip():
     with st.spinner("🤖 Analyzing emotions with AI..."):
         time.sleep(0.5)
         
-        if model and vectorizer:
-            cleaned_text = preprocess_text(user_input)
-            vectorized_text = vectorizer.transform([cleaned_text])
-            prediction = model.predict(vectorized_text)[0]
+        if cascade:
+            cleaned_text = preprocess_text(user_input, fast_features['keep_negation'])
+            probs = cascade.predict_proba([user_input])[0]
+            prediction = cascade.classes_[np.argmax(probs)]
             emotion = num_to_emo[prediction]
-            probs = model.predict_proba(vectorized_text)[0]
+            if monitor:
+                monitor.observe([emotion])
             
             confidence = np.max(probs) * 100
             complexity = np.std(probs) * 100
@@ -530,6 +569,27 @@ with st.sidebar:
     
     st.divider()
     
+    # Drift Monitoring
+    if monitor and monitor.doc_pos:
+        stats = monitor.metrics()
+        with st.expander("📈 Drift Monitor"):
+            st.metric("OOV Token Rate", f"{stats['oov_rate'] * 100:.1f}%")
+            st.metric("Empty Vector Rate", f"{stats['empty_vector_rate'] * 100:.1f}%")
+            st.metric("Label Drift (TV)", f"{stats['label_drift']:.3f}")
+            st.caption(f"Last {min(stats['docs_seen'], monitor.window)} of {stats['docs_seen']} analyses")
+    
+        st.divider()
+    
+    # Cascade Routing
+    if cascade and cascade.total:
+        routing = cascade.stats()
+        with st.expander("🔀 Cascade Routing"):
+            for name, share in routing['stage_share'].items():
+                st.metric(name, f"{share * 100:.1f}% of traffic")
+            st.caption(f"Throughput: {routing['docs_per_second']:.0f} docs/s over {routing['docs_seen']} analyses")
+    
+        st.divider()
+    
     # Clear button
     if st.button("🗑️ Clear Analysis", use_container_width=True, key="clear_btn"):
         st.session_state.user_input = ""
@@ -0,0 +1,78 @@
+import threading
+import time
+import numpy as np
+from src.processor import preprocess_text
+
+# Max probability below which a row is escalated to the next stage
+DEFAULT_THRESHOLD = 0.6
+
+
+class Cascade:
+    """Cheap-first inference: each stage only sees rows the previous one was unsure of.
+
+    `stages` is a list of (name, vectorizer, model, keep_negation) tuples
+    ordered from cheapest to most expensive; each stage cleans raw text with
+    the preprocessing it was trained with. A row is escalated when its max
+    probability is below `threshold`. Escalated rows are scored as one batch
+    per stage. Routing counters are updated under a lock, so one cascade can
+    be shared across sessions.
+    """
+
+    def __init__(self, stages, threshold=DEFAULT_THRESHOLD):
+        classes = [list(model.classes_) for _, _, model, _ in stages]
+        if any(c != classes[0] for c in classes):
+            raise ValueError("All cascade stages must share the same classes")
+        self.stages = stages
+        self.threshold = threshold
+        self.classes_ = np.array(classes[0])
+        self.handled = np.zeros(len(stages), dtype=np.int64)
+        self.total = 0
+        self.elapsed = 0.0
+        self.lock = threading.Lock()
+
+    def predict_proba(self, texts):
+        """Probabilities for a batch of raw texts"""
+        if not len(texts):
+            return np.zeros((0, len(self.classes_)))
+        start = time.perf_counter()
+        texts = np.asarray(texts, dtype=object)
+        probs = None
+        handled = np.zeros(len(self.stages), dtype=np.int64)
+        pending = np.arange(len(texts))
+        for i, (_, vectorizer, model, keep_negation) in enumerate(self.stages):
+            cleaned = [preprocess_text(t, keep_negation) for t in texts[pending]]
+            stage_probs = model.predict_proba(vectorizer.transform(cleaned))
+            if probs is None:
+                probs = stage_probs
+            else:
+                probs[pending] = stage_probs
+            if i == len(self.stages) - 1:
+                handled[i] = len(pending)
+                break
+            unsure = stage_probs.max(axis=1) < self.threshold
+            handled[i] = int((~unsure).sum())
+            pending = pending[unsure]
+            if not len(pending):
+                break
+        with self.lock:
+            self.handled += handled
+            self.total += len(texts)
+            self.elapsed += time.perf_counter() - start
+        return probs
+
+    def predict(self, texts):
+        """Predicted class labels for a batch of raw texts"""
+        return self.classes_[self.predict_proba(texts).argmax(axis=1)]
+
+    def stats(self):
+        """Fraction of traffic resolved by each stage and end-to-end throughput"""
+        with self.lock:
+            handled, total, elapsed = self.handled.copy(), self.total, self.elapsed
+        return {
+            'docs_seen': total,
+            'stage_share': {
+                name: float(n / total) if total else 0.0
+                for (name, _, _, _), n in zip(self.stages, handled)
+            },
+            'docs_per_second': total / elapsed if elapsed else 0.0,
+        }
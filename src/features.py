@@ -0,0 +1,37 @@
+import os
+import pickle
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Feature modes selectable with `--features`; all use sparse float32 matrices
+FEATURE_CONFIGS = {
+    'word_1': {'keep_negation': False, 'vectorizer': {}},
+    'word_1_2': {'keep_negation': True, 'vectorizer': {
+        'ngram_range': (1, 2), 'min_df': 2, 'max_features': 50000, 'sublinear_tf': True}},
+    'word_1_3': {'keep_negation': True, 'vectorizer': {
+        'ngram_range': (1, 3), 'min_df': 2, 'max_features': 100000, 'sublinear_tf': True}},
+    'char_2_5': {'keep_negation': True, 'vectorizer': {
+        'analyzer': 'char_wb', 'ngram_range': (2, 5), 'min_df': 3, 'max_features': 100000,
+        'sublinear_tf': True}},
+}
+
+# What the notebook-trained model in models/ was built with
+DEFAULT_FEATURES = {'mode': 'word_1', 'keep_negation': False}
+
+
+def build_vectorizer(mode):
+    """Unfitted TF-IDF vectorizer for a FEATURE_CONFIGS mode"""
+    return TfidfVectorizer(dtype=np.float32, **FEATURE_CONFIGS[mode]['vectorizer'])
+
+
+def feature_settings(mode):
+    """The settings saved next to a vectorizer trained with `mode`"""
+    return {'mode': mode, 'keep_negation': FEATURE_CONFIGS[mode]['keep_negation']}
+
+
+def load_feature_settings(path):
+    """Read saved feature settings, defaulting for models trained before they were saved"""
+    if not os.path.exists(path):
+        return dict(DEFAULT_FEATURES)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
@@ -0,0 +1,141 @@
+import threading
+import warnings
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+TRAIN_PATH = 'data/train.txt'
+
+
+def load_label_prior(path=TRAIN_PATH):
+    """Emotion frequencies of the training set, as a dict of proportions"""
+    counts = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            emotion = line.rsplit(';', 1)[1]
+            counts[emotion] = counts.get(emotion, 0) + 1
+    total = sum(counts.values())
+    return {em: n / total for em, n in counts.items()}
+
+
+class DriftMonitor:
+    """Running OOV / empty-vector / label-distribution statistics.
+
+    Every statistic lives in a fixed-size ring buffer holding the last
+    `window` documents, so memory does not grow with traffic. Buffer updates
+    are guarded by a lock, so one monitor can be shared across sessions.
+    """
+
+    def __init__(self, vectorizer, prior, window=1000):
+        self.vectorizer = vectorizer
+        self.vocabulary = vectorizer.vocabulary_
+        self.analyzer = vectorizer.build_analyzer()
+        self.labels = sorted(prior)
+        self.label_index = {em: i for i, em in enumerate(self.labels)}
+        self.prior = np.array([prior[em] for em in self.labels])
+        self.window = window
+        self.oov_tokens = np.zeros(window, dtype=np.int32)
+        self.tokens = np.zeros(window, dtype=np.int32)
+        self.empty = np.zeros(window, dtype=bool)
+        self.predicted = np.full(window, -1, dtype=np.int8)
+        self.doc_pos = 0
+        self.pred_pos = 0
+        self.lock = threading.RLock()
+        # The first batch is checked against vectorizer.transform; if the
+        # rebuilt tf-idf ever diverges, vectorize with the vectorizer instead
+        self.verified = False
+        self.exact = True
+
+    def transform(self, texts):
+        """Vectorize a batch of cleaned texts, recording OOV and empty rates.
+
+        Each text is analyzed once; the TF-IDF matrix is built from the same
+        tokens the statistics are counted on, matching `vectorizer.transform`.
+        """
+        indptr, indices, counts = [0], [], []
+        for text in texts:
+            tokens = self.analyzer(text)
+            known = [self.vocabulary[t] for t in tokens if t in self.vocabulary]
+            indices.extend(known)
+            indptr.append(len(indices))
+            counts.append((len(tokens) - len(known), len(tokens), not known))
+        with self.lock:
+            for oov, n_tokens, empty in counts:
+                i = self.doc_pos % self.window
+                self.oov_tokens[i] = oov
+                self.tokens[i] = n_tokens
+                self.empty[i] = empty
+                self.doc_pos += 1
+        if not self.exact:
+            return self.vectorizer.transform(texts)
+        X = self._tfidf(indptr, indices, len(texts))
+        if not self.verified and len(texts):
+            self._verify(texts, X)
+        return X if self.exact else self.vectorizer.transform(texts)
+
+    def _verify(self, texts, X):
+        """Check the rebuilt matrix against the vectorizer's own transform once"""
+        if abs(self.vectorizer.transform(texts) - X).max() > 1e-6:
+            warnings.warn("DriftMonitor TF-IDF differs from vectorizer.transform; "
+                          "falling back to vectorizer.transform")
+            self.exact = False
+        self.verified = True
+
+    def _tfidf(self, indptr, indices, n_docs):
+        """Apply the vectorizer's count -> tf-idf weighting to token indices"""
+        v = self.vectorizer
+        data = np.ones(len(indices), dtype=v.dtype)
+        X = sp.csr_matrix((data, indices, indptr), shape=(n_docs, len(self.vocabulary)))
+        X.sum_duplicates()
+        if v.binary:
+            X.data[:] = 1
+        if v.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        # Like TfidfTransformer, skip idf weighting when it is not fitted
+        idf = getattr(v, 'idf_', None) if v.use_idf else None
+        if idf is not None:
+            X.data *= idf[X.indices]
+        if v.norm is not None:
+            X = normalize(X, norm=v.norm, copy=False)
+        return X
+
+    def observe(self, emotions):
+        """Record predicted emotion names for a batch"""
+        with self.lock:
+            for emotion in emotions:
+                self.predicted[self.pred_pos % self.window] = self.label_index.get(emotion, -1)
+                self.pred_pos += 1
+
+    def label_distribution(self):
+        """Predicted-label proportions over the current window"""
+        with self.lock:
+            recent = self.predicted[:min(self.pred_pos, self.window)].copy()
+        counts = np.bincount(recent[recent >= 0], minlength=len(self.labels))
+        total = counts.sum()
+        return counts / total if total else np.zeros(len(self.labels))
+
+    def metrics(self):
+        """Snapshot of the monitored statistics as a plain dict"""
+        with self.lock:
+            n_docs = min(self.doc_pos, self.window)
+            # Token-weighted, so token-less docs only count towards empty_vector_rate
+            n_tokens = int(self.tokens[:n_docs].sum())
+            n_oov = int(self.oov_tokens[:n_docs].sum())
+            n_empty = int(self.empty[:n_docs].sum())
+            docs_seen, preds_seen = self.doc_pos, self.pred_pos
+            dist = self.label_distribution()
+        # Total variation distance between recent predictions and the training prior
+        drift = 0.5 * float(np.abs(dist - self.prior).sum()) if preds_seen else 0.0
+        return {
+            'docs_seen': docs_seen,
+            'predictions_seen': preds_seen,
+            'oov_rate': n_oov / n_tokens if n_tokens else 0.0,
+            'empty_vector_rate': n_empty / n_docs if n_docs else 0.0,
+            'label_distribution': dict(zip(self.labels, dist.tolist())),
+            'label_prior': dict(zip(self.labels, self.prior.tolist())),
+            'label_drift': drift,
+        }
@@ -10,7 +10,11 @@ except LookupError:
 
 stop_words = set(stopwords.words('english'))
 
-def preprocess_text(text):
+# Stopwords that flip sentiment ("not happy"); kept for n-gram feature modes
+negation_words = {'no', 'nor', 'not'}
+stop_words_keep_negation = stop_words - negation_words
+
+def preprocess_text(text, keep_negation=False):
     """Complete preprocessing pipeline used during training"""
     # 1. Lowercase
     text = text.lower()
@@ -18,7 +22,8 @@ def preprocess_text(text):
     text = text.translate(str.maketrans('', '', string.punctuation))
     # 3. Remove numbers
     text = ''.join([i for i in text if not i.isdigit()])
-    # 4. Remove stopwords
+    # 4. Remove stopwords (optionally keeping negations)
     words = text.split()
-    cleaned = [word for word in words if word not in stop_words]
+    drop = stop_words_keep_negation if keep_negation else stop_words
+    cleaned = [word for word in words if word not in drop]
     return ' '.join(cleaned)
\ No newline at end of file
@@ -0,0 +1,196 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import numpy as np
+from src.cascade import Cascade, DEFAULT_THRESHOLD
+from src.features import load_feature_settings
+from src.monitor import DriftMonitor, load_label_prior
+
+STORE_PATH = 'data/scores.db'
+METRICS_PATH = 'data/drift_metrics.jsonl'
+MODELS_DIR = 'models'
+EMOTIONS = ('anger', 'fear', 'joy', 'love', 'sadness', 'surprise')
+CHUNK_SIZE = 10000
+
+
+def text_hash(text):
+    """Stable key for a raw input text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def model_version(paths, settings=()):
+    """Short content hash of the model files and scoring settings a score was produced with"""
+    digest = hashlib.sha256()
+    for setting in settings:
+        digest.update(repr(setting).encode('utf-8'))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultStore:
+    """Append-only SQLite store of scored texts, one column per emotion.
+
+    Rows are keyed by (model_version, text_hash) and never updated, so a
+    corpus only needs scoring once per model. Queries select just the
+    emotion columns they need.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.conn = sqlite3.connect(path)
+        columns = ', '.join(f'{em} REAL NOT NULL' for em in EMOTIONS)
+        self.conn.execute(
+            f'CREATE TABLE IF NOT EXISTS scores ('
+            f'text_hash TEXT NOT NULL, model_version TEXT NOT NULL, '
+            f'emotion TEXT NOT NULL, {columns}, '
+            f'PRIMARY KEY (model_version, text_hash)) WITHOUT ROWID'
+        )
+        self.conn.commit()
+
+    def missing(self, hashes, version):
+        """Hashes from `hashes` with no stored score for `version`"""
+        found = set()
+        unique = list(set(hashes))
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            marks = ', '.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT text_hash FROM scores WHERE model_version = ? AND text_hash IN ({marks})',
+                [version, *chunk]
+            )
+            found.update(h for (h,) in rows)
+        return [h for h in unique if h not in found]
+
+    def append(self, hashes, version, probs):
+        """Store probability rows, ordered as EMOTIONS, for the given hashes"""
+        labels = [EMOTIONS[i] for i in np.argmax(probs, axis=1)]
+        rows = [(h, version, em, *map(float, p)) for h, em, p in zip(hashes, labels, probs)]
+        marks = ', '.join('?' * (3 + len(EMOTIONS)))
+        self.conn.executemany(f'INSERT OR IGNORE INTO scores VALUES ({marks})', rows)
+        self.conn.commit()
+
+    def score(self, texts, version, predict_proba, chunk_size=CHUNK_SIZE):
+        """Score only texts not yet stored for `version`; returns the number scored.
+
+        `predict_proba` maps a list of raw texts to probabilities ordered as EMOTIONS.
+        Each chunk is committed as it is scored, so an interrupted job resumes
+        where it stopped.
+        """
+        by_hash = {text_hash(t): t for t in texts}
+        todo = self.missing(list(by_hash), version)
+        for i in range(0, len(todo), chunk_size):
+            chunk = todo[i:i + chunk_size]
+            self.append(chunk, version, predict_proba([by_hash[h] for h in chunk]))
+        return len(todo)
+
+    def query(self, version, columns=EMOTIONS):
+        """Read only the requested columns for one model version"""
+        allowed = ('text_hash', 'emotion') + EMOTIONS
+        if any(c not in allowed for c in columns):
+            raise ValueError(f"Unknown column, expected one of {allowed}")
+        cursor = self.conn.execute(
+            f'SELECT {", ".join(columns)} FROM scores WHERE model_version = ?', (version,)
+        )
+        return cursor.fetchall()
+
+    def emotion_counts(self, version):
+        """Number of stored texts per predicted emotion"""
+        rows = self.conn.execute(
+            'SELECT emotion, COUNT(*) FROM scores WHERE model_version = ? GROUP BY emotion',
+            (version,)
+        )
+        return dict(rows.fetchall())
+
+    def close(self):
+        self.conn.close()
+
+
+def load_scorer(threshold=DEFAULT_THRESHOLD):
+    """Cascade over the trained models, its version and the drift monitor on its first stage"""
+    stage_files = [
+        ('tfidf_lr', 'best_emotion_model.pkl', 'tfidf_vectorizer.pkl', 'tfidf_features.pkl'),
+        ('char_svm', 'char_svm_model.pkl', 'char_tfidf_vectorizer.pkl', 'char_tfidf_features.pkl'),
+    ]
+    stages, paths, settings = [], [], [threshold]
+    for name, model_file, vectorizer_file, features_file in stage_files:
+        model_path = f'{MODELS_DIR}/{model_file}'
+        vectorizer_path = f'{MODELS_DIR}/{vectorizer_file}'
+        # The char stage is optional; skip it until it has been trained
+        if stages and not os.path.exists(model_path):
+            continue
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer = pickle.load(f)
+        features = load_feature_settings(f'{MODELS_DIR}/{features_file}')
+        if not stages:
+            # Batch traffic is monitored at the first stage, which sees every row
+            monitor = DriftMonitor(vectorizer, load_label_prior(), window=CHUNK_SIZE)
+            vectorizer = monitor
+        stages.append((name, vectorizer, model, features['keep_negation']))
+        paths += [model_path, vectorizer_path]
+        settings.append((name, features['mode'], features['keep_negation']))
+    cascade = Cascade(stages, threshold=threshold)
+    mappings_path = f'{MODELS_DIR}/emotion_mappings.pkl'
+    with open(mappings_path, 'rb') as f:
+        num_to_emo = pickle.load(f)['numbers_to_emotions']
+    # The mappings decide the column order, so they are part of the version too
+    paths.append(mappings_path)
+    # Reorder model classes into the store's fixed EMOTIONS column order
+    order = [list(cascade.classes_).index(n) for n in
+             sorted(num_to_emo, key=lambda n: EMOTIONS.index(num_to_emo[n]))]
+
+    def predict_proba(texts):
+        probs = cascade.predict_proba(texts)
+        monitor.observe([num_to_emo[c] for c in cascade.classes_[probs.argmax(axis=1)]])
+        return probs[:, order]
+
+    return predict_proba, model_version(paths, settings), monitor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a text file into the result store')
+    parser.add_argument('input', help='one text per line; a trailing ";<emotion>" label is ignored')
+    parser.add_argument('--store', default=STORE_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--metrics', default=METRICS_PATH,
+                        help='drift metrics of each run are appended here as JSON lines')
+    args = parser.parse_args()
+
+    texts = []
+    with open(args.input, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+            text, sep, label = line.rpartition(';')
+            # Only strip a known label, so texts containing ';' stay intact
+            texts.append(text if sep and label in EMOTIONS else line)
+
+    predict_proba, version, monitor = load_scorer(args.threshold)
+    store = ResultStore(args.store)
+    scored = store.score(texts, version, predict_proba)
+    print(f"Model version {version}: scored {scored} new of {len(set(texts))} unique texts")
+    for emotion, n in sorted(store.emotion_counts(version).items()):
+        print(f"  {emotion}: {n}")
+    store.close()
+
+    if monitor.doc_pos:
+        metrics = monitor.metrics()
+        print(f"Drift (last {min(monitor.doc_pos, monitor.window)} new texts): "
+              f"OOV rate {metrics['oov_rate']:.3f}, "
+              f"empty-vector rate {metrics['empty_vector_rate']:.3f}, "
+              f"label drift {metrics['label_drift']:.3f}")
+        with open(args.metrics, 'a', encoding='utf-8') as f:
+            record = {'time': time.time(), 'model_version': version, 'input': args.input, **metrics}
+            f.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import pickle
+import time
+import pandas as pd
+from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.metrics import accuracy_score
+from src.processor import preprocess_text
+from src.cascade import Cascade, DEFAULT_THRESHOLD
+from src.features import (
+    FEATURE_CONFIGS, build_vectorizer, feature_settings, load_feature_settings
+)
+
+DATA_PATH = 'data/train.txt'
+MODELS_DIR = 'models'
+
+
+def load_data(path=DATA_PATH):
+    """Load the raw training set, encoding labels with the saved mappings"""
+    df = pd.read_csv(path, sep=';', header=None, names=['text', 'emotions'])
+    with open(f'{MODELS_DIR}/emotion_mappings.pkl', 'rb') as f:
+        mappings = pickle.load(f)
+    df['emotions'] = df['emotions'].map(mappings['emotions_to_numbers'])
+    return train_test_split(df['text'], df['emotions'], test_size=0.20, random_state=42)
+
+
+def clean(texts, keep_negation=False):
+    """Apply preprocess_text to a Series of raw texts"""
+    return texts.apply(preprocess_text, keep_negation=keep_negation)
+
+
+def train_fast(X_train, y_train, mode='word_1'):
+    """First stage: TF-IDF + grid-searched Logistic Regression"""
+    vectorizer = build_vectorizer(mode)
+    X = vectorizer.fit_transform(X_train)
+    C = [0.01, 0.1, 1, 10, 50]
+    # liblinear is one-vs-rest, as in the notebook; newer scikit-learn only
+    # accepts it for multiclass data when wrapped explicitly
+    param_grid = [
+        {'clf': [OneVsRestClassifier(LogisticRegression(solver='liblinear', max_iter=1000))],
+         'clf__estimator__C': C},
+        {'clf': [LogisticRegression(solver='lbfgs', max_iter=1000)], 'clf__C': C},
+    ]
+    grid = GridSearchCV(Pipeline([('clf', LogisticRegression())]), param_grid,
+                        cv=5, scoring='accuracy', n_jobs=-1)
+    grid.fit(X, y_train)
+    return vectorizer, grid.best_estimator_['clf']
+
+
+def train_char(X_train, y_train, mode='char_2_5'):
+    """Escalation stage: TF-IDF (character n-grams by default) + calibrated linear SVM"""
+    vectorizer = build_vectorizer(mode)
+    X = vectorizer.fit_transform(X_train)
+    # Calibration gives the SVM a predict_proba comparable to the first stage
+    model = CalibratedClassifierCV(LinearSVC(C=0.5), cv=3)
+    model.fit(X, y_train)
+    return vectorizer, model
+
+
+def evaluate_cascade(X_test, y_test, char_vectorizer, char_model, char_features,
+                     threshold=DEFAULT_THRESHOLD):
+    """Score the raw test set through the saved fast stage and the new char stage"""
+    _, fast_model_file, fast_vectorizer_file, fast_features_file = STAGES['fast']
+    with open(f'{MODELS_DIR}/{fast_model_file}', 'rb') as f:
+        fast_model = pickle.load(f)
+    with open(f'{MODELS_DIR}/{fast_vectorizer_file}', 'rb') as f:
+        fast_vectorizer = pickle.load(f)
+    fast_features = load_feature_settings(f'{MODELS_DIR}/{fast_features_file}')
+    cascade = Cascade([
+        ('tfidf_lr', fast_vectorizer, fast_model, fast_features['keep_negation']),
+        ('char_svm', char_vectorizer, char_model, char_features['keep_negation']),
+    ], threshold=threshold)
+    accuracy = accuracy_score(y_test, cascade.predict(list(X_test)))
+    stats = cascade.stats()
+    print(f"\nCascade (threshold={threshold}) Accuracy: {accuracy:.4f}")
+    for name, share in stats['stage_share'].items():
+        print(f"  {name}: {share * 100:.1f}% of traffic")
+    print(f"  Throughput: {stats['docs_per_second']:.0f} docs/s")
+
+
+def compare_features(X_train, X_test, y_train, y_test, stage='fast'):
+    """Report the accuracy / latency / model-size trade-off of each feature mode.
+
+    Every mode is trained with `stage`'s own trainer, so each row describes the
+    model `--stage <stage> --features <mode>` would ship.
+    """
+    train = STAGES[stage][0]
+    print(f"\nEach mode trained with {train.__name__} ('{stage}' stage)")
+    print(f"{'mode':<10} {'features':>9} {'accuracy':>9} {'ms/1k docs':>11} {'size (KB)':>10}")
+    for name, config in FEATURE_CONFIGS.items():
+        train_text = clean(X_train, config['keep_negation'])
+        test_text = clean(X_test, config['keep_negation'])
+        vectorizer, model = train(train_text, y_train, name)
+
+        # Latency covers vectorizing and scoring the held-out split in one batch
+        start = time.perf_counter()
+        y_pred = model.predict(vectorizer.transform(test_text))
+        latency = (time.perf_counter() - start) / len(test_text) * 1e6
+
+        accuracy = accuracy_score(y_test, y_pred)
+        size = len(pickle.dumps((vectorizer, model))) / 1024
+        n_features = len(vectorizer.vocabulary_)
+        print(f"{name:<10} {n_features:>9} {accuracy:>9.4f} {latency:>11.1f} {size:>10.0f}")
+
+
+# stage: (trainer, model file, vectorizer file, feature settings file)
+STAGES = {
+    'fast': (train_fast, 'best_emotion_model.pkl', 'tfidf_vectorizer.pkl', 'tfidf_features.pkl'),
+    'char': (train_char, 'char_svm_model.pkl', 'char_tfidf_vectorizer.pkl', 'char_tfidf_features.pkl'),
+}
+DEFAULT_MODES = {'fast': 'word_1', 'char': 'char_2_5'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train SentiMentX models')
+    parser.add_argument('--stage', choices=sorted(STAGES) + ['compare'], default='char')
+    parser.add_argument('--compare-stage', choices=sorted(STAGES), default='fast',
+                        help="stage whose trainer '--stage compare' evaluates each mode with")
+    parser.add_argument('--features', choices=sorted(FEATURE_CONFIGS),
+                        help='feature mode for the trained stage (default: word_1 for fast, char_2_5 for char)')
+    args = parser.parse_args()
+
+    print("Loading data...")
+    X_train, X_test, y_train, y_test = load_data()
+    if args.stage == 'compare':
+        compare_features(X_train, X_test, y_train, y_test, args.compare_stage)
+        return
+
+    train, model_file, vectorizer_file, features_file = STAGES[args.stage]
+    mode = args.features or DEFAULT_MODES[args.stage]
+    features = feature_settings(mode)
+    train_text = clean(X_train, features['keep_negation'])
+    test_text = clean(X_test, features['keep_negation'])
+    print(f"Training '{args.stage}' stage with '{mode}' features...")
+    vectorizer, model = train(train_text, y_train, mode)
+    accuracy = accuracy_score(y_test, model.predict(vectorizer.transform(test_text)))
+    print(f"Test Set Accuracy: {accuracy:.4f}")
+
+    with open(f'{MODELS_DIR}/{model_file}', 'wb') as f:
+        pickle.dump(model, f)
+    with open(f'{MODELS_DIR}/{vectorizer_file}', 'wb') as f:
+        pickle.dump(vectorizer, f)
+    # Serving reads these back so it preprocesses exactly as training did
+    with open(f'{MODELS_DIR}/{features_file}', 'wb') as f:
+        pickle.dump(features, f)
+    print(f"✓ Saved {model_file}, {vectorizer_file} and {features_file}")
+
+    if args.stage == 'char':
+        evaluate_cascade(X_test, y_test, vectorizer, model, features)
+
+
+if __name__ == '__main__':
+    main()